@@ -1,49 +1,258 @@
 # app.py
 import streamlit as st
 import pandas as pd
-from datetime import date, datetime 
-from io import BytesIO
+import numpy as np
 import os
+import ast
 import importlib.util
+from functools import lru_cache
+from types import MappingProxyType
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 LOGIC_MODULE_DIR = "logic_modules"
 
+# PPT defaults shared by the Base Plan and Rider epic configuration. These are
+# read-only lookups used on every rerun, so they live at module scope instead
+# of being rebuilt per epic iteration.
+PPT_NAMES = ("Single Pay", "Limited Pay (5 pay)", "Limited Pay (10 pay)", "Limited Pay (15 pay)", "Limited Pay (Pay till age 60)", "Regular Pay")
+
+FREQUENCY_OPTIONS = ("Annual", "Half-Yearly", "Quarterly", "Monthly", "Single Pay")
+FREQUENCY_MAP = MappingProxyType({f: i + 1 for i, f in enumerate(FREQUENCY_OPTIONS)})
+
+ENTRY_AGE_PPT_RANGES = MappingProxyType({
+    "Single Pay": (18, 65),
+    "Limited Pay (5 pay)": (18, 65),
+    "Limited Pay (10 pay)": (18, 65),
+    "Limited Pay (15 pay)": (18, 65),
+    "Limited Pay (Pay till age 60)": (18, 55),
+    "Regular Pay": (18, 65)
+})
+POLICY_TERM_PPT_RANGES = MappingProxyType({
+    "Single Pay": (1, 5),
+    "Limited Pay (5 pay)": (10, 67),
+    "Limited Pay (10 pay)": (15, 67),
+    "Limited Pay (15 pay)": (20, 67),
+    "Limited Pay (Pay till age 60)": (5, 67),
+    "Regular Pay": (5, 67)
+})
+MATURITY_AGE_PPT_RANGES = MappingProxyType({
+    "Single Pay": (19, 85),
+    "Limited Pay (5 pay)": (24, 85),
+    "Limited Pay (10 pay)": (29, 85),
+    "Limited Pay (15 pay)": (34, 85),
+    "Limited Pay (Pay till age 60)": (65, 85),
+    "Regular Pay": (23, 85)
+})
+MATURITY_AGE_PPT_RANGES_RIDER = MappingProxyType({
+    "Single Pay": (19, 75),
+    "Limited Pay (5 pay)": (19, 75),
+    "Limited Pay (10 pay)": (19, 75),
+    "Limited Pay (15 pay)": (19, 75),
+    "Limited Pay (Pay till age 60)": (19, 75),
+    "Regular Pay": (19, 75)
+})
+PREMIUM_PAYING_PPT_RANGES = MappingProxyType({
+    "Single Pay": (1, 1),
+    "Limited Pay (5 pay)": (5, 5),
+    "Limited Pay (10 pay)": (10, 10),
+    "Limited Pay (15 pay)": (15, 15),
+    "Limited Pay (Pay till age 60)": (5, 42),
+    "Regular Pay": (5, 67)
+})
+
+# Structure-of-arrays view of the range dicts above: one (epic, ppt, min/max)
+# int16 table per tab, so the PPT editors are seeded with two array slices
+# instead of a dict lookup per PPT.
+EPIC_TO_ID = MappingProxyType({"EntryAge": 0, "PolicyTerm": 1, "MaturityAge": 2, "PremiumPayingTerm": 3})
+PPT_DEFAULTS = np.array(
+    [[ENTRY_AGE_PPT_RANGES[p] for p in PPT_NAMES],
+     [POLICY_TERM_PPT_RANGES[p] for p in PPT_NAMES],
+     [MATURITY_AGE_PPT_RANGES[p] for p in PPT_NAMES],
+     [PREMIUM_PAYING_PPT_RANGES[p] for p in PPT_NAMES]], dtype=np.int16)
+PPT_DEFAULTS_RIDER = PPT_DEFAULTS.copy()
+PPT_DEFAULTS_RIDER[EPIC_TO_ID["MaturityAge"]] = [MATURITY_AGE_PPT_RANGES_RIDER[p] for p in PPT_NAMES]
+
 # --- All helper functions (display_generation_summary, etc.) remain unchanged ---
-def display_generation_summary(df_results):
-    st.subheader("📊 Generation Summary")
-    total_cases_summary = len(df_results)
-    
+# Hashing a large frame per rerun is O(N) and object identity can be recycled
+# between generations, so _df goes unhashed and the cache keys on the per-run
+# file_prefix stamped at generation time -- same scheme as the export helpers.
+@st.cache_data(show_spinner=False)
+def _summary_stats(_df, cache_key):
+    total_cases = len(_df)
+
     positive_cases = 0
     negative_cases = 0
-    if 'Test_Type' in df_results.columns:
-        test_type_counts = df_results['Test_Type'].value_counts()
-        positive_cases = test_type_counts.get('Positive', 0)
-        negative_cases = test_type_counts.get('Negative', 0)
+    if 'Test_Type' in _df.columns:
+        # Single O(N) pass in C instead of value_counts() plus two lookups.
+        codes = _df['Test_Type'].astype(
+            pd.CategoricalDtype(['Positive', 'Negative'])).cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=2)
+        positive_cases, negative_cases = int(counts[0]), int(counts[1])
+
+    epic_dist = _df['Epic'].value_counts() if 'Epic' in _df.columns else None
+    return total_cases, positive_cases, negative_cases, epic_dist
+
+def display_generation_summary(df_results):
+    st.subheader("📊 Generation Summary")
+    total_cases_summary, positive_cases, negative_cases, epic_dist = _summary_stats(
+        df_results, st.session_state.file_prefix)
 
     col_sum1, col_sum2, col_sum3 = st.columns(3)
     col_sum1.metric("Total Cases", total_cases_summary)
     col_sum2.metric("✔️ Positive Cases", positive_cases)
     col_sum3.metric("❌ Negative Cases", negative_cases)
 
-    if 'Epic' in df_results.columns:
-        epic_counts = df_results['Epic'].value_counts()
+    if epic_dist is not None:
         with st.expander("Case Distribution by Epic", expanded=False):
-            if not epic_counts.empty:
-                st.bar_chart(epic_counts)
+            if not epic_dist.empty:
+                st.bar_chart(epic_dist)
             else:
                 st.caption("No Epic data to display or 'Epic' column missing.")
 
 def highlight_rule_outcomes(s):
-    def get_style(val_str):
-        if 'Fail' in val_str:
-            return 'background-color: #FFE0E0; color: #A00000;' 
-        elif val_str == 'Pass': 
-            return 'background-color: #E0FFE0; color: #006000;' 
-        return ''
-    return [get_style(str(v)) for v in s]
-
-def get_available_logic_modules():
+    # Vectorized over the whole column: one numpy C-level pass instead of a
+    # Python str()/substring check per cell.
+    vals = s.to_numpy(dtype=object).astype(str)
+    is_fail = np.char.find(vals, 'Fail') >= 0
+    is_pass = vals == 'Pass'
+    return np.select(
+        [is_fail, is_pass],
+        ['background-color: #FFE0E0; color: #A00000;',
+         'background-color: #E0FFE0; color: #006000;'],
+        default=''
+    )
+
+def display_dataframe_quickly(df, rule_columns, max_rows=1000, **st_dataframe_kwargs):
+    """Display a DataFrame without styling more rows than are visible.
+
+    Styler CSS generation and Arrow serialization are O(rows x cols), so for
+    large frames only a max_rows window (picked via a start-row slider) is
+    styled and shipped to the browser.
+    """
+    if len(df) > max_rows:
+        n_pages = -(-len(df) // max_rows)
+        page = st.slider("Page", 1, n_pages, 1, key="df_page_start")
+        start = (page - 1) * max_rows
+        df = df.iloc[start:start + max_rows]
+        st.caption(f"Showing rows {start} to {start + len(df) - 1} of page {page}/{n_pages}")
+    st.dataframe(
+        df.style.apply(highlight_rule_outcomes, subset=rule_columns),
+        **st_dataframe_kwargs
+    )
+
+@st.cache_data(show_spinner=False)
+def _sample_rows(_df, cache_key, n=10):
+    # Keeps the sample stable across reruns of the results view; without this
+    # every download click reshuffled (and restyled) a fresh random sample.
+    # Same keying scheme as the export helpers below: _df unhashed, keyed on
+    # the per-run file_prefix.
+    return _df.sample(min(n, len(_df)))
+
+# The _df parameter is deliberately unhashed (leading underscore): hashing a
+# large frame per rerun is O(N), and object identity can be recycled between
+# generations. cache_key is the per-run file_prefix stamped at generation
+# time, so each run gets its own entries.
+@st.cache_data(show_spinner=False)
+def to_excel_bytes(_df, cache_key):
+    # Serializing to xlsx is the slowest part of the results view; cache it so
+    # reruns from the download buttons or the pagination slider reuse the bytes.
+    # xlsxwriter writes faster than openpyxl; fall back to openpyxl where it
+    # isn't installed. (No constant_memory here: pandas emits cells
+    # column-by-column, which that mode silently drops.)
+    from io import BytesIO
+    output_excel = BytesIO()
+    try:
+        writer = pd.ExcelWriter(output_excel, engine='xlsxwriter')
+    except ImportError:
+        writer = pd.ExcelWriter(output_excel, engine='openpyxl')
+    with writer:
+        _df.to_excel(writer, index=False, sheet_name='TestCases')
+    return output_excel.getvalue()
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(_df, cache_key):
+    # Write straight into a bytes buffer in 64K-row chunks rather than
+    # materializing one giant Python string and then encoding it.
+    from io import BytesIO
+    output_csv = BytesIO()
+    _df.to_csv(output_csv, index=False, chunksize=65536,
+               encoding='utf-8', lineterminator='\n')
+    return output_csv.getvalue()
+
+@st.fragment
+def render_results():
+    """Results view (summary, sample, downloads) as an isolated fragment.
+
+    Interactions inside it (e.g. the pagination slider) rerun only this
+    fragment, not the whole sidebar/config script. The epic-config UI itself
+    is batched by its st.form, so the fragment boundary sits here.
+    """
+    df_to_display = st.session_state.generated_df
+
+    st.header(f"Generated using: {st.session_state.selected_display_name}")
+    st.divider()
+
+    display_generation_summary(df_to_display)
+    st.divider()
+
+    st.subheader(f"📑 Sample Data (10 random rows from {len(df_to_display)} total)")
+    rule_columns_to_style = st.session_state.rule_columns
+
+    sample_df = _sample_rows(df_to_display, st.session_state.file_prefix)
+    # sample_df = sample_df.sort_values(by="TUID", ascending=True)
+    display_dataframe_quickly(sample_df, rule_columns_to_style, height=400, use_container_width=True)
+
+    with st.expander(f"Browse All {len(df_to_display)} Rows", expanded=False):
+        display_dataframe_quickly(df_to_display, rule_columns_to_style, height=400, use_container_width=True)
+    st.divider()
+
+    st.subheader("💾 Download Results")
+    file_prefix = st.session_state.file_prefix
+
+    excel_data = to_excel_bytes(df_to_display, file_prefix)
+    csv_data = to_csv_bytes(df_to_display, file_prefix)
+
+    col_dl1, col_dl2 = st.columns(2)
+    with col_dl1:
+        st.download_button(
+            label="📥 Download Excel File (.xlsx)", data=excel_data,
+            file_name=f"{file_prefix}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True, key="download_excel"
+        )
+    with col_dl2:
+        st.download_button(
+            label="📄 Download CSV File (.csv)", data=csv_data,
+            file_name=f"{file_prefix}.csv", mime="text/csv",
+            use_container_width=True, key="download_csv"
+        )
+    st.caption("Files will download automatically after clicking.")
+
+def _logic_dir_mtime_ns():
+    try:
+        return os.stat(LOGIC_MODULE_DIR).st_mtime_ns
+    except OSError:
+        return 0
+
+def _read_module_name(path, fallback):
+    # Pull the top-level MODULE_NAME assignment out of the source with ast
+    # instead of exec_module-ing the file: just the display label is needed,
+    # so there is no reason to run the module's (pandas-heavy) imports.
+    try:
+        tree = ast.parse(open(path, 'rb').read())
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(
+                    isinstance(t, ast.Name) and t.id == 'MODULE_NAME' for t in node.targets):
+                if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                    return node.value.value
+    except Exception:
+        pass
+    return fallback
+
+@st.cache_resource(show_spinner=False)
+def get_available_logic_modules(dir_mtime_ns):
+    # dir_mtime_ns keys the cache so the module list is rebuilt only when
+    # files in logic_modules/ actually change, not on every rerun.
     modules = {}
     if not os.path.exists(LOGIC_MODULE_DIR):
         return modules
@@ -51,31 +260,283 @@ def get_available_logic_modules():
         for filename in os.listdir(LOGIC_MODULE_DIR):
             if filename.endswith(".py") and not filename.startswith("__"):
                 module_name_py_file = filename[:-3]
-                try:
-                    spec = importlib.util.spec_from_file_location(module_name_py_file, os.path.join(LOGIC_MODULE_DIR, filename))
-                    module_obj = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module_obj)
-                    display_name = getattr(module_obj, 'MODULE_NAME', module_name_py_file.replace("_", " ").title())
-                    modules[display_name] = module_name_py_file
-                except Exception: 
-                    modules[module_name_py_file.replace("_", " ").title()] = module_name_py_file
+                fallback = module_name_py_file.replace("_", " ").title()
+                display_name = _read_module_name(os.path.join(LOGIC_MODULE_DIR, filename), fallback)
+                modules[display_name] = module_name_py_file
     except Exception as e:
         st.sidebar.error(f"Error listing logic modules: {e}")
     return modules
 
+@st.cache_resource(show_spinner=False)
+def _load_logic_module_cached(module_name_py, file_mtime_ns):
+    # file_mtime_ns keys the cache so edits to a module during development
+    # still trigger a reload on the next rerun.
+    module_path = os.path.join(LOGIC_MODULE_DIR, f"{module_name_py}.py")
+    spec = importlib.util.spec_from_file_location(module_name_py, module_path)
+    logic_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(logic_module)
+    return logic_module
+
 def load_logic_module(module_name_py):
     try:
         module_path = os.path.join(LOGIC_MODULE_DIR, f"{module_name_py}.py")
-        spec = importlib.util.spec_from_file_location(module_name_py, module_path)
-        logic_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(logic_module)
-        return logic_module
+        return _load_logic_module_cached(module_name_py, os.stat(module_path).st_mtime_ns)
     except Exception as e:
         st.error(f"Error loading logic module '{module_name_py}': {e}")
         st.exception(e)
         return None
 
 
+# Editable bounds for the PPT table, per epic (MaturityAge depends on the tab).
+PPT_EDITOR_BOUNDS = MappingProxyType({
+    "EntryAge": (0, 85),
+    "PolicyTerm": (5, 80),
+    "PremiumPayingTerm": (0, 85),
+})
+
+@lru_cache(maxsize=None)
+def _widget_key(prefix, name, key_suffix=""):
+    # The epic renderers rebuild the same small set of widget keys on every
+    # rerun; memoizing them turns the repeated f-string formatting into a
+    # dict hit.
+    return f"{prefix}_{name}{key_suffix}"
+
+
+def _ppt_config_from_rows(rows, show_counts, num_positive_global, num_negative_global):
+    """Fold PPT editor rows ({"PPT", "Enable", "Min", "Max"[, "Pos", "Neg"]})
+    into the epic_counts shape generate_test_cases expects."""
+    ppt_age_ranges, ppt_pos_counts, ppt_neg_counts, ppt_enabled = {}, {}, {}, {}
+    any_enabled = False
+    for row in rows:
+        if row["Enable"]:
+            ppt_age_ranges[row["PPT"]] = (int(row["Min"]), int(row["Max"]))
+            if show_counts:
+                ppt_pos_counts[row["PPT"]] = int(row["Pos"])
+                ppt_neg_counts[row["PPT"]] = int(row["Neg"])
+            ppt_enabled[row["PPT"]] = True
+            any_enabled = True
+        else:
+            ppt_enabled[row["PPT"]] = False
+
+    if not any_enabled:
+        return None
+    if show_counts:
+        return {
+            "ppt_age_ranges": ppt_age_ranges,
+            "ppt_pos_counts": ppt_pos_counts,
+            "ppt_neg_counts": ppt_neg_counts,
+            "ppt_enabled": ppt_enabled
+        }
+    return {
+        "ppt_age_ranges": ppt_age_ranges,
+        "ppt_enabled": ppt_enabled,
+        "positive": num_positive_global,
+        "negative": num_negative_global
+    }
+
+def _render_age_epic(epic_key, epic_desc, key_suffix, count_mode, select_all,
+                     num_positive_global, num_negative_global,
+                     ppt_defaults, maturity_slider_max):
+    """PPT-table epics: EntryAge / PolicyTerm / MaturityAge / PremiumPayingTerm.
+
+    The whole PPT table is a single st.data_editor: one widget delta per epic
+    instead of ~30 (checkbox + slider + number_inputs per PPT row). Both count
+    modes share this path; show_counts just adds the Pos/Neg columns.
+    """
+    is_selected = st.checkbox(epic_desc, value=select_all, key=_widget_key("epic_cb", epic_key, key_suffix))
+    if not is_selected:
+        # A deselected epic contributes nothing to the config, so don't pay
+        # for building and diffing its PPT editor at all.
+        return None
+    defaults = ppt_defaults[EPIC_TO_ID[epic_key]]
+    min_bound, max_bound = (19, maturity_slider_max) if epic_key == "MaturityAge" else PPT_EDITOR_BOUNDS[epic_key]
+    show_counts = count_mode == "Set Individual Counts for Each Epic"
+
+    with st.expander("Show/Hide PPT Configuration", expanded=False):
+        data = {
+            "PPT": list(PPT_NAMES),
+            "Enable": True,
+            "Min": defaults[:, 0],
+            "Max": defaults[:, 1],
+        }
+        # required=True keeps the cells non-clearable; a None here would blow
+        # up the int() fold below on the next Apply.
+        column_config = {
+            "PPT": st.column_config.TextColumn(disabled=True),
+            "Min": st.column_config.NumberColumn(min_value=min_bound, max_value=max_bound, required=True),
+            "Max": st.column_config.NumberColumn(min_value=min_bound, max_value=max_bound, required=True),
+        }
+        if show_counts:
+            data["Pos"] = 5
+            data["Neg"] = 5
+            column_config["Pos"] = st.column_config.NumberColumn(min_value=0, required=True)
+            column_config["Neg"] = st.column_config.NumberColumn(min_value=0, required=True)
+
+        editor_key = _widget_key("ppt_editor", epic_key, key_suffix) if show_counts else _widget_key("ppt_editor_all", epic_key, key_suffix)
+        edited = st.data_editor(
+            pd.DataFrame(data), hide_index=True, num_rows="fixed", use_container_width=True,
+            key=editor_key, column_config=column_config)
+
+    return _ppt_config_from_rows(
+        (row._asdict() for row in edited.itertuples(index=False)),
+        show_counts, num_positive_global, num_negative_global)
+
+def _render_freq_epic(epic_key, epic_desc, key_suffix, count_mode, select_all,
+                      num_positive_global, num_negative_global,
+                      ppt_defaults, maturity_slider_max):
+    if count_mode == "Set Individual Counts for Each Epic":
+        row = st.columns([2, 1.5, 1.5])
+        with row[0]:
+            is_selected = st.checkbox(epic_desc, value=select_all, key=_widget_key("epic_cb", epic_key, key_suffix))
+        with row[1]:
+            pos_count = st.number_input(f"Pos {epic_key}", min_value=0, value=5, key=_widget_key("epic_pos", epic_key, key_suffix), label_visibility="collapsed", placeholder="Pos")
+        with row[2]:
+            neg_count = st.number_input(f"Neg {epic_key}", min_value=0, value=5, key=_widget_key("epic_neg", epic_key, key_suffix), label_visibility="collapsed", placeholder="Neg")
+    else:
+        is_selected = st.checkbox(epic_desc, value=select_all, key=_widget_key("epic_cb", epic_key, key_suffix))
+        pos_count, neg_count = num_positive_global, num_negative_global
+
+    # LOAD_FAST instead of LOAD_GLOBAL + LOAD_ATTR inside the widget loop.
+    cb = st.checkbox
+    freq_cols = st.columns(len(FREQUENCY_OPTIONS)+1)
+    selected_frequencies = []
+    for i, freq in enumerate(FREQUENCY_OPTIONS):
+        with freq_cols[i+1]:
+            if cb(freq, value=is_selected, key=_widget_key("freq_cb", freq, key_suffix)):
+                selected_frequencies.append(freq)
+
+    mapped_frequencies = [FREQUENCY_MAP[f] for f in selected_frequencies]
+
+    if is_selected:
+        return {
+            "positive": pos_count,
+            "negative": neg_count,
+            "payment_frequency_options": mapped_frequencies
+        }
+    return None
+
+def _render_sa_epic(epic_key, epic_desc, key_suffix, count_mode, select_all,
+                    num_positive_global, num_negative_global,
+                    ppt_defaults, maturity_slider_max):
+    individual = count_mode == "Set Individual Counts for Each Epic"
+    is_selected = st.checkbox(epic_desc, value=select_all, key=_widget_key("epic_cb", epic_key, key_suffix))
+    with st.expander("Show/Hide PPT Configuration", expanded=False):
+        col_spec = [0.5, 2, 1, 1, 1, 1] if individual else [0.5, 2, 1, 1]
+
+        header = st.columns(col_spec)
+        # with header[0]: st.markdown("**Enable**")
+        with header[1]: st.markdown("**PPT Type**")
+        with header[2]: st.markdown("**Min**")
+        with header[3]: st.markdown("**Max**")
+        if individual:
+            with header[4]: st.markdown("**Pos**")
+            with header[5]: st.markdown("**Neg**")
+
+        row_sp = st.columns(col_spec)
+        with row_sp[0]:
+            sp = st.checkbox("Enable", value=is_selected, key=_widget_key("sa_enabled", epic_key, key_suffix), label_visibility="collapsed")
+        with row_sp[1]:
+            st.markdown("SinglePay")
+        with row_sp[2]:
+            min_sp = st.number_input("Min SinglePay", min_value=0, value=2500000, key=_widget_key("min_sp", epic_key, key_suffix), label_visibility="collapsed")
+        with row_sp[3]:
+            max_sp = st.number_input("Max SinglePay", min_value=min_sp, value=5000000, key=_widget_key("max_sp", epic_key, key_suffix), label_visibility="collapsed")
+        if individual:
+            with row_sp[4]:
+                pos_sp = st.number_input("Pos SinglePay", min_value=0, value=5, key=_widget_key("pos_sp", epic_key, key_suffix), label_visibility="collapsed")
+            with row_sp[5]:
+                neg_sp = st.number_input("Neg SinglePay", min_value=0, value=5, key=_widget_key("neg_sp", epic_key, key_suffix), label_visibility="collapsed")
+
+        row_oth = st.columns(col_spec)
+        with row_oth[0]:
+            oth = st.checkbox("Enable", value=is_selected, key=_widget_key("oth_enabled", epic_key, key_suffix), label_visibility="collapsed")
+        with row_oth[1]:
+            st.markdown("Others")
+        with row_oth[2]:
+            min_oth = st.number_input("Min Others", min_value=0, value=5000000, key=_widget_key("min_oth", epic_key, key_suffix), label_visibility="collapsed")
+        if individual:
+            with row_oth[4]:
+                pos_oth = st.number_input("Pos Others", min_value=0, value=5, key=_widget_key("pos_oth", epic_key, key_suffix), label_visibility="collapsed")
+            with row_oth[5]:
+                neg_oth = st.number_input("Neg Others", min_value=0, value=5, key=_widget_key("neg_oth", epic_key, key_suffix), label_visibility="collapsed")
+
+        if is_selected:
+            counts = {}
+            if sp:
+                counts["Single Pay"] = {
+                    "min_val": min_sp,
+                    "max_val": max_sp,
+                    "positive": num_positive_global,
+                    "negative": num_negative_global
+                }
+            if oth:
+                counts["Others"] = {
+                    "min_val": min_oth,
+                    "positive": num_positive_global,
+                    "negative": num_negative_global
+                }
+            return counts
+    return None
+
+def _render_default_epic(epic_key, epic_desc, key_suffix, count_mode, select_all,
+                         num_positive_global, num_negative_global,
+                         ppt_defaults, maturity_slider_max):
+    if count_mode == "Set Individual Counts for Each Epic":
+        # For other epics, number inputs for pos/neg alongside the checkbox
+        row = st.columns([2, 1.5, 1.5])
+        with row[0]:
+            is_selected = st.checkbox(epic_desc, value=select_all, key=_widget_key("epic_cb", epic_key, key_suffix))
+        with row[1]:
+            pos_count = st.number_input(f"Pos {epic_key}", min_value=0, value=5, key=_widget_key("epic_pos", epic_key, key_suffix), label_visibility="collapsed", placeholder="Pos")
+        with row[2]:
+            neg_count = st.number_input(f"Neg {epic_key}", min_value=0, value=5, key=_widget_key("epic_neg", epic_key, key_suffix), label_visibility="collapsed", placeholder="Neg")
+    else:
+        is_selected = st.checkbox(epic_desc, value=select_all, key=_widget_key("epic_cb", epic_key, key_suffix))
+        pos_count, neg_count = num_positive_global, num_negative_global
+
+    if is_selected:
+        return {"positive": pos_count, "negative": neg_count}
+    return None
+
+# O(1) dispatch on epic_key; unknown epics fall back to the default renderer.
+EPIC_HANDLERS = {
+    "EntryAge": _render_age_epic,
+    "PolicyTerm": _render_age_epic,
+    "MaturityAge": _render_age_epic,
+    "PremiumPayingTerm": _render_age_epic,
+    "PaymentFrequency": _render_freq_epic,
+    "SumAssuredValidation": _render_sa_epic,
+}
+
+def render_epic_config(epic_map, key_suffix, count_mode, select_all, num_positive_global, num_negative_global,
+                       ppt_defaults, maturity_slider_max, include_sa_config=True):
+    """Render the epic/PPT configuration widgets for one tab.
+
+    The Base Plan and Rider tabs share this single implementation; key_suffix
+    ("" or "_rider") keeps their widget keys independent in session state.
+    select_all comes from the one master checkbox rendered above the tabs.
+    Returns (selected_epics, epic_counts) built from the current widget state.
+    """
+    selected_epics = []
+    epic_counts = {}
+
+    st.markdown("#### Configure Epics and Case Counts")
+    # st.markdown("---")
+
+    for epic_key, epic_desc in epic_map.items():
+        handler = EPIC_HANDLERS.get(epic_key, _render_default_epic)
+        if handler is _render_sa_epic and not include_sa_config:
+            handler = _render_default_epic
+        counts = handler(epic_key, epic_desc, key_suffix, count_mode, select_all,
+                         num_positive_global, num_negative_global,
+                         ppt_defaults, maturity_slider_max)
+        if counts is not None:
+            selected_epics.append(epic_key)
+            epic_counts[epic_key] = counts
+
+    return selected_epics, epic_counts
+
+
 # --- Streamlit App UI ---
 st.set_page_config(
     page_title="Test Data Generator",
@@ -83,42 +544,49 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
-# Hide Streamlit's default menu and footer
-hide_streamlit_style = """
+# All page CSS (hidden default menu/footer, title styling, expander fonts)
+# goes out in one st.markdown call: one WebSocket delta instead of three.
+_GLOBAL_CSS = """
     <style>
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
-    </style>
-    """
-st.markdown(hide_streamlit_style, unsafe_allow_html=True)
-# Inject custom CSS
-st.markdown("""
-    <style>
     .custom-title {
         font-size:40px !important;
         font-weight: bold;
         color: #2E86C1;
     }
+    /* Make sure all descendant text elements inherit the size */
+    div[data-testid="stExpander"] button * ,
+    div[data-testid="stExpander"] summary * ,
+    div[data-testid="stExpander"] [role="button"] * {
+        font-size: 16px !important;
+        font-weight: 600 !important;
+    }
     </style>
-    """, unsafe_allow_html=True)
+    """
+st.markdown(_GLOBAL_CSS, unsafe_allow_html=True)
 
 # Use the custom class
 st.markdown('<h1 class="custom-title">⚙️ Product Rule Validation Test Data Generator</h1>', unsafe_allow_html=True)
 
 # --- Session State Initialization ---
-if 'generated_df' not in st.session_state: st.session_state.generated_df = None
-if 'selected_module_name_py' not in st.session_state: st.session_state.selected_module_name_py = None
-if 'selected_display_name' not in st.session_state: st.session_state.selected_display_name = None
-if 'processing' not in st.session_state: st.session_state.processing = False
-if 'epic_counts_to_generate' not in st.session_state: st.session_state.epic_counts_to_generate = {}
-if 'epic_counts_to_generate_rider' not in st.session_state: st.session_state.epic_counts_to_generate_rider = {}
+st.session_state.setdefault('generated_df', None)
+st.session_state.setdefault('selected_module_name_py', None)
+st.session_state.setdefault('logic_module', None)
+st.session_state.setdefault('selected_display_name', None)
+st.session_state.setdefault('file_prefix', None)
+st.session_state.setdefault('rule_columns', ())
+st.session_state.setdefault('selected_epics', [])
+st.session_state.setdefault('epic_counts', {})
+st.session_state.setdefault('selected_epics_rider', [])
+st.session_state.setdefault('epic_counts_rider', {})
 
 
 # --- Sidebar Configuration ---
 with st.sidebar:
     st.header("🛠️ Configuration")
     
-    available_modules = get_available_logic_modules()
+    available_modules = get_available_logic_modules(_logic_dir_mtime_ns())
     if not available_modules:
         st.error(f"Logic module directory ('{LOGIC_MODULE_DIR}') not found or empty.")
         st.stop() 
@@ -138,8 +606,8 @@ with st.sidebar:
     if selected_display_name_from_ui != st.session_state.selected_display_name:
         st.session_state.selected_display_name = selected_display_name_from_ui
         st.session_state.selected_module_name_py = available_modules[selected_display_name_from_ui]
-        st.session_state.generated_df = None 
-        st.session_state.processing = False 
+        st.session_state.logic_module = load_logic_module(st.session_state.selected_module_name_py)
+        st.session_state.generated_df = None
         st.rerun()
 
     st.divider()
@@ -170,756 +638,114 @@ epic_counts_rider = {}
 selected_epics_rider = []
 
 if st.session_state.selected_module_name_py and st.session_state.generated_df is None:
-    st.markdown("""
-                <style>
-                /* Make sure all descendant text elements inherit the size */
-                div[data-testid="stExpander"] button * ,
-                div[data-testid="stExpander"] summary * ,
-                div[data-testid="stExpander"] [role="button"] * {
-                    font-size: 16px !important;
-                    font-weight: 600 !important;
-                }
-            """, unsafe_allow_html=True)
-    
-    tab3a, tab3b = st.tabs(["Base Plan Epics", "Rider Epics"])
-    with tab3a:
-        # st.header("Base Plan Epics")
-        logic_module = load_logic_module(st.session_state.selected_module_name_py)
-        if logic_module and hasattr(logic_module, 'EPIC_MAP'):
-
-            epic_map = getattr(logic_module, 'EPIC_MAP')
-            select_all = st.checkbox("Select/Deselect All Epics", value=True, key='select_all_epics_master')
-            st.markdown("#### Configure Epics and Case Counts")
-            # st.markdown("---")
-            ppt_names = ["Single Pay", "Limited Pay (5 pay)", "Limited Pay (10 pay)", "Limited Pay (15 pay)", "Limited Pay (Pay till age 60)", "Regular Pay"]
-
-            for epic_key, epic_desc in epic_map.items():
-                toggle_key = None
-                ppt_names = ["Single Pay", "Limited Pay (5 pay)", "Limited Pay (10 pay)", "Limited Pay (15 pay)", "Limited Pay (Pay till age 60)", "Regular Pay"]
-                entry_age_ppt_ranges = {
-                    "Single Pay": (18, 65),
-                    "Limited Pay (5 pay)": (18, 65),
-                    "Limited Pay (10 pay)": (18, 65),
-                    "Limited Pay (15 pay)": (18, 65),
-                    "Limited Pay (Pay till age 60)": (18, 55),
-                    "Regular Pay": (18, 65)
-                }
-                policy_term_ppt_ranges = {
-                    "Single Pay": (1, 5),
-                    "Limited Pay (5 pay)": (10, 67),
-                    "Limited Pay (10 pay)": (15, 67),
-                    "Limited Pay (15 pay)": (20, 67),
-                    "Limited Pay (Pay till age 60)": (5, 67),
-                    "Regular Pay": (5, 67)
-                }
-                maturity_age_ppt_ranges = {
-                    "Single Pay": (19, 85),
-                    "Limited Pay (5 pay)": (24, 85),
-                    "Limited Pay (10 pay)": (29, 85),
-                    "Limited Pay (15 pay)": (34, 85),
-                    "Limited Pay (Pay till age 60)": (65, 85),
-                    "Regular Pay": (23, 85)
-                }
-                premium_paying_ppt_ranges = {
-                    "Single Pay": (1, 1),
-                    "Limited Pay (5 pay)": (5, 5),
-                    "Limited Pay (10 pay)": (10, 10),
-                    "Limited Pay (15 pay)": (15, 15),
-                    "Limited Pay (Pay till age 60)": (5, 42),
-                    "Regular Pay": (5, 67)
-                }
+    submitted = False
 
-                if count_mode == "Set Individual Counts for Each Epic":
-                    if epic_key == "EntryAge" or epic_key == "PremiumPayingTerm" or epic_key == "PolicyTerm" or epic_key == "MaturityAge":
-
-                        is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        with st.expander("Show/Hide PPT Configuration", expanded=False):
-                            ppt_age_ranges, ppt_pos_counts, ppt_neg_counts, ppt_enabled = {}, {}, {}, {}
-
-                            header = st.columns([0.5, 2, 2, 1, 1])
-                            # with header[0]: st.markdown("**Enable**")
-                            with header[1]: st.markdown("**PPT Name**")
-                            with header[2]: st.markdown("**Min/Max**")
-                            with header[3]: st.markdown("**Pos**")
-                            with header[4]: st.markdown("**Neg**")
-
-                            for ppt in ppt_names:
-                                row = st.columns([0.5, 2, 2, 1, 1])
-                                with row[0]:
-                                    enabled = st.checkbox("Enable", value=is_selected, key=f"ppt_enabled_{epic_key}_{ppt}", label_visibility="collapsed")
-                                with row[1]: st.markdown(ppt)
-                                with row[2]:
-                                    if(epic_key == "EntryAge"):
-                                        min_age, max_age = st.slider("Entry Age", 0, 85, entry_age_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "PolicyTerm"):
-                                            min_age, max_age = st.slider("Policy Term", 5, 80, policy_term_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "MaturityAge"):
-                                        min_age, max_age = st.slider("Maturity Age", 19, 85, maturity_age_ppt_ranges[ppt], key=f"maturity_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                    else:
-                                        if(premium_paying_ppt_ranges[ppt][0] == premium_paying_ppt_ranges[ppt][1]):
-                                            min_age = max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt][0], key=f"entry_age_slider_{epic_key}_{ppt}", label_visibility="collapsed")
-                                        else:
-                                            min_age, max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                with row[3]:
-                                    pos = st.number_input("Pos", 0, value=5, key=f"epic_pos_{epic_key}_{ppt}", label_visibility="collapsed")
-                                with row[4]:
-                                    neg = st.number_input("Neg", 0, value=5, key=f"epic_neg_{epic_key}_{ppt}", label_visibility="collapsed")
-
-                                if enabled:
-                                    ppt_age_ranges[ppt] = (min_age, max_age)
-                                    ppt_pos_counts[ppt] = pos
-                                    ppt_neg_counts[ppt] = neg
-                                    ppt_enabled[ppt] = True
-                                else:
-                                    ppt_enabled[ppt] = False
-
-                            if is_selected and any(ppt_enabled.values()):
-                                selected_epics.append(epic_key)
-                                epic_counts[epic_key] = {
-                                    "ppt_age_ranges": ppt_age_ranges,
-                                    "ppt_pos_counts": ppt_pos_counts,
-                                    "ppt_neg_counts": ppt_neg_counts,
-                                    "ppt_enabled": ppt_enabled
-                                }
-
-                    elif epic_key == "PaymentFrequency":
-                        row = st.columns([2, 1.5, 1.5])
-                        with row[0]:        
-                            is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        with row[1]:
-                            pos_count = st.number_input(f"Pos {epic_key}", min_value=0, value=5, key=f"epic_pos_{epic_key}", label_visibility="collapsed", placeholder="Pos")
-                        with row[2]:
-                            neg_count = st.number_input(f"Neg {epic_key}", min_value=0, value=5, key=f"epic_neg_{epic_key}", label_visibility="collapsed", placeholder="Neg")
-
-                        frequency_options = ["Annual", "Half-Yearly", "Quarterly", "Monthly", "Single Pay"]
-                        frequency_map = {"Annual": 1, "Half-Yearly": 2, "Quarterly": 3, "Monthly": 4, "Single Pay": 5}
-                        freq_cols = st.columns(len(frequency_options)+1)
-                        selected_frequencies = []
-                        for i, freq in enumerate(frequency_options):
-                            with freq_cols[i+1]:
-                                if st.checkbox(freq, value=is_selected, key=f"freq_cb_{freq}"):
-                                    selected_frequencies.append(freq)
-
-                        mapped_frequencies = [frequency_map[f] for f in selected_frequencies]
-
-                        if is_selected:
-                            selected_epics.append(epic_key)
-                            epic_counts[epic_key] = {
-                                "positive": pos_count,
-                                "negative": neg_count,
-                                "payment_frequency_options": mapped_frequencies
-                            }
-
-                    elif epic_key == "SumAssuredValidation":
-                        is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        with st.expander("Show/Hide PPT Configuration", expanded=False):
-
-                            header = st.columns([0.5, 2, 1, 1, 1, 1])
-                            # with header[0]: st.markdown("**Enable**")
-                            with header[1]: st.markdown("**PPT Type**")
-                            with header[2]: st.markdown("**Min**")
-                            with header[3]: st.markdown("**Max**")
-                            with header[4]: st.markdown("**Pos**")
-                            with header[5]: st.markdown("**Neg**")
-
-                            row_sp = st.columns([0.5, 2, 1, 1, 1, 1])
-                            with row_sp[0]:
-                                sp = st.checkbox("Enable", value=is_selected, key=f"sa_enabled_{epic_key}", label_visibility="collapsed")
-                            with row_sp[1]:
-                                st.markdown("SinglePay")
-                            with row_sp[2]:
-                                min_sp = st.number_input("Min SinglePay", min_value=0, value=2500000, key=f"min_sp_{epic_key}", label_visibility="collapsed")
-                            with row_sp[3]:
-                                max_sp = st.number_input("Max SinglePay", min_value=min_sp, value=5000000, key=f"max_sp_{epic_key}", label_visibility="collapsed")
-                            with row_sp[4]:
-                                pos_sp = st.number_input("Pos SinglePay", min_value=0, value=5, key=f"pos_sp_{epic_key}", label_visibility="collapsed")
-                            with row_sp[5]:
-                                neg_sp = st.number_input("Neg SinglePay", min_value=0, value=5, key=f"neg_sp_{epic_key}", label_visibility="collapsed")
-
-                            row_oth = st.columns([0.5, 2, 1, 1, 1, 1])
-                            with row_oth[0]:
-                                oth = st.checkbox("Enable", value=is_selected, key=f"oth_enabled_{epic_key}", label_visibility="collapsed")
-                            with row_oth[1]:
-                                st.markdown("Others")
-                            with row_oth[2]:
-                                min_oth = st.number_input("Min Others", min_value=0, value=5000000, key=f"min_oth_{epic_key}", label_visibility="collapsed")
-                            with row_oth[4]:
-                                pos_oth = st.number_input("Pos Others", min_value=0, value=5, key=f"pos_oth_{epic_key}", label_visibility="collapsed")
-                            with row_oth[5]:
-                                neg_oth = st.number_input("Neg Others", min_value=0, value=5, key=f"neg_oth_{epic_key}", label_visibility="collapsed")
-
-                            if is_selected:
-                                selected_epics.append(epic_key)
-                                if epic_key not in epic_counts:
-                                    epic_counts[epic_key] = {}
-                                if sp:
-                                    epic_counts[epic_key]["Single Pay"] = {
-                                        "min_val": min_sp,
-                                        "max_val": max_sp,
-                                        "positive": num_positive_global,
-                                        "negative": num_negative_global
-                                    }
-                                if oth:
-                                    epic_counts[epic_key]["Others"] = {
-                                        "min_val": min_oth,
-                                        "positive": num_positive_global,
-                                        "negative": num_negative_global
-                                    }
-
-                    else:
-                        # For other epics, use slider for min/max and number inputs for pos/neg
-                        row = st.columns([2, 1.5, 1.5])
-                        with row[0]:        
-                            is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        with row[1]:
-                            pos_count = st.number_input(f"Pos {epic_key}", min_value=0, value=5, key=f"epic_pos_{epic_key}", label_visibility="collapsed", placeholder="Pos")
-                        with row[2]:
-                            neg_count = st.number_input(f"Neg {epic_key}", min_value=0, value=5, key=f"epic_neg_{epic_key}", label_visibility="collapsed", placeholder="Neg")
-                        if is_selected:
-                            selected_epics.append(epic_key)
-                            epic_counts[epic_key] = {
-                                "positive": pos_count,
-                                "negative": neg_count
-                            }
-
-                else:  # Apply Same Count to All Epics
-                    if epic_key == "EntryAge" or epic_key == "PremiumPayingTerm" or epic_key == "PolicyTerm" or epic_key == "MaturityAge":
-
-                        is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        with st.expander("Show/Hide PPT Configuration", expanded=False):
-                            ppt_age_ranges, ppt_enabled = {}, {}
-
-                            for ppt in ppt_names:
-                                row = st.columns([0.5, 2, 2])
-                                with row[0]:
-                                    enabled = st.checkbox("Enable", value=is_selected, key=f"ppt_enabled_all_{epic_key}_{ppt}", label_visibility="collapsed")
-                                with row[1]: st.markdown(ppt)
-                                with row[2]:
-                                    if(epic_key == "EntryAge"):
-                                        min_age, max_age = st.slider("Entry Age", 0, 85, entry_age_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "PolicyTerm"):
-                                        min_age, max_age = st.slider("Policy Term", 5, 80, policy_term_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "MaturityAge"):
-                                        min_age, max_age = st.slider("Maturity Age", 19, 85, maturity_age_ppt_ranges[ppt], key=f"maturity_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                    else:
-                                        if(premium_paying_ppt_ranges[ppt][0] == premium_paying_ppt_ranges[ppt][1]):
-                                            min_age = max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt][0], key=f"entry_age_slider_{epic_key}_{ppt}", label_visibility="collapsed")
-                                        else:
-                                            min_age, max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}",
-                                                                label_visibility="collapsed")
-                                if enabled:
-                                    ppt_age_ranges[ppt] = (min_age, max_age)
-                                    ppt_enabled[ppt] = True
-                                else:
-                                    ppt_enabled[ppt] = False
-
-                            if is_selected and any(ppt_enabled.values()):
-                                selected_epics.append(epic_key)
-                                epic_counts[epic_key] = {
-                                    "ppt_age_ranges": ppt_age_ranges,
-                                    "ppt_enabled": ppt_enabled,
-                                    "positive": num_positive_global,
-                                    "negative": num_negative_global
-                                }
-
-                    elif epic_key == "PaymentFrequency":
-                        is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        frequency_options = ["Annual", "Half-Yearly", "Quarterly", "Monthly", "Single Pay"]
-                        frequency_map = {"Annual": 1, "Half-Yearly": 2, "Quarterly": 3, "Monthly": 4, "Single Pay": 5}
-                        freq_cols = st.columns(len(frequency_options)+1)
-                        selected_frequencies = []
-                        for i, freq in enumerate(frequency_options):
-                            with freq_cols[i+1]:
-                                if st.checkbox(freq, value=is_selected, key=f"freq_cb_{freq}"):
-                                    selected_frequencies.append(freq)
-
-                        mapped_frequencies = [frequency_map[f] for f in selected_frequencies]
-
-                        if is_selected:
-                            selected_epics.append(epic_key)
-                            epic_counts[epic_key] = {
-                                "positive": num_positive_global,
-                                "negative": num_negative_global,
-                                "payment_frequency_options": mapped_frequencies
-                            }
-
-                    elif epic_key == "SumAssuredValidation":
-                        is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        with st.expander("Show/Hide PPT Configuration", expanded=False):
-
-                            header = st.columns([0.5, 2, 1, 1])
-                            # with header[0]: st.markdown("**Enable**")
-                            with header[1]: st.markdown("**PPT Type**")
-                            with header[2]: st.markdown("**Min**")
-                            with header[3]: st.markdown("**Max**")
-
-                            row_sp = st.columns([0.5, 2, 1, 1])
-                            with row_sp[0]:
-                                sp = st.checkbox("Enable", value=is_selected, key=f"sa_enabled_{epic_key}", label_visibility="collapsed")
-                            with row_sp[1]:
-                                st.markdown("SinglePay")
-                            with row_sp[2]:
-                                min_sp = st.number_input("Min SinglePay", min_value=0, value=2500000, key=f"min_sp_{epic_key}", label_visibility="collapsed")
-                            with row_sp[3]:
-                                max_sp = st.number_input("Max SinglePay", min_value=min_sp, value=5000000, key=f"max_sp_{epic_key}", label_visibility="collapsed")
-
-                            row_oth = st.columns([0.5, 2, 1, 1])
-                            with row_oth[0]:
-                                oth = st.checkbox("Enable", value=is_selected, key=f"oth_enabled_{epic_key}", label_visibility="collapsed")
-                            with row_oth[1]:
-                                st.markdown("Others")
-                            with row_oth[2]:
-                                min_oth = st.number_input("Min Others", min_value=0, value=5000000, key=f"min_oth_{epic_key}", label_visibility="collapsed")
-
-                            if is_selected:
-                                selected_epics.append(epic_key)
-                                if epic_key not in epic_counts:
-                                    epic_counts[epic_key] = {}
-                                if sp:
-                                    epic_counts[epic_key]["Single Pay"] = {
-                                        "min_val": min_sp,
-                                        "max_val": max_sp,
-                                        "positive": num_positive_global,
-                                        "negative": num_negative_global
-                                    }
-                                if oth:
-                                    epic_counts[epic_key]["Others"] = {
-                                        "min_val": min_oth,
-                                        "positive": num_positive_global,
-                                        "negative": num_negative_global
-                                    }
-
-                    else:
-                        is_selected = st.checkbox(epic_desc, value=select_all, key=f"epic_cb_{epic_key}")
-                        if is_selected:
-                            selected_epics.append(epic_key)
-                            epic_counts[epic_key] = {"positive": num_positive_global, "negative": num_negative_global}
-
-                # print(epic_counts)
-            # print("Epics Selected:", selected_epics, "\n")
-
-    # For added riders if any
-    with tab3b:
-        # st.header("Rider Epics")
+    # Loaded once on product change; reruns from widget interactions read the
+    # module straight out of session state.
+    logic_module = st.session_state.logic_module
+    if logic_module is None:
         logic_module = load_logic_module(st.session_state.selected_module_name_py)
-        if logic_module and hasattr(logic_module, 'EPIC_MAP_RIDER'):
-
-            epic_map_rider = getattr(logic_module, 'EPIC_MAP_RIDER')
-            select_all_rider = st.checkbox("Select/Deselect All Epics", value=True, key='select_all_epics_master_rider')
-            st.markdown("#### Configure Epics and Case Counts")
-            # st.markdown("---")
-            ppt_names = ["Single Pay", "Limited Pay (5 pay)", "Limited Pay (10 pay)", "Limited Pay (15 pay)", "Limited Pay (Pay till age 60)", "Regular Pay"]
-
-            for epic_key, epic_desc in epic_map_rider.items():
-                toggle_key = None
-                ppt_names = ["Single Pay", "Limited Pay (5 pay)", "Limited Pay (10 pay)", "Limited Pay (15 pay)", "Limited Pay (Pay till age 60)", "Regular Pay"]
-                entry_age_ppt_ranges = {
-                    "Single Pay": (18, 65),
-                    "Limited Pay (5 pay)": (18, 65),
-                    "Limited Pay (10 pay)": (18, 65),
-                    "Limited Pay (15 pay)": (18, 65),
-                    "Limited Pay (Pay till age 60)": (18, 55),
-                    "Regular Pay": (18, 65)
-                }
-                policy_term_ppt_ranges = {
-                    "Single Pay": (1, 5),
-                    "Limited Pay (5 pay)": (10, 67),
-                    "Limited Pay (10 pay)": (15, 67),
-                    "Limited Pay (15 pay)": (20, 67),
-                    "Limited Pay (Pay till age 60)": (5, 67),
-                    "Regular Pay": (5, 67)
-                }
-                maturity_age_ppt_ranges = {
-                    "Single Pay": (19, 75),
-                    "Limited Pay (5 pay)": (19, 75),
-                    "Limited Pay (10 pay)": (19, 75),
-                    "Limited Pay (15 pay)": (19, 75),
-                    "Limited Pay (Pay till age 60)": (19, 75),
-                    "Regular Pay": (19, 75)
-                }
-                premium_paying_ppt_ranges = {
-                    "Single Pay": (1, 1),
-                    "Limited Pay (5 pay)": (5, 5),
-                    "Limited Pay (10 pay)": (10, 10),
-                    "Limited Pay (15 pay)": (15, 15),
-                    "Limited Pay (Pay till age 60)": (5, 42),
-                    "Regular Pay": (5, 67)
-                }
+        st.session_state.logic_module = logic_module
+
+    # The whole epic configuration lives in one form: widget edits stay
+    # client-side and only commit (one single rerun) when Apply is clicked,
+    # instead of rerunning the script per checkbox/slider/number_input.
+    with st.form("epic_config", clear_on_submit=False):
+        # One master checkbox drives the defaults of both tabs.
+        select_all = st.checkbox("Select/Deselect All Epics", value=True, key='select_all_epics_master')
+
+        tab3a, tab3b = st.tabs(["Base Plan Epics", "Rider Epics"])
+        with tab3a:
+            # st.header("Base Plan Epics")
+            if logic_module and hasattr(logic_module, 'EPIC_MAP'):
+                selected_epics, epic_counts = render_epic_config(
+                    getattr(logic_module, 'EPIC_MAP'), "", count_mode, select_all,
+                    num_positive_global, num_negative_global,
+                    PPT_DEFAULTS, 85)
+
+        # For added riders if any
+        with tab3b:
+            # st.header("Rider Epics")
+            if logic_module and hasattr(logic_module, 'EPIC_MAP_RIDER'):
+                selected_epics_rider, epic_counts_rider = render_epic_config(
+                    getattr(logic_module, 'EPIC_MAP_RIDER'), "_rider", count_mode, select_all,
+                    num_positive_global, num_negative_global,
+                    PPT_DEFAULTS_RIDER, 75, include_sa_config=False)
+            else:
+                # Skip the whole rider epic loop for products without riders.
+                st.info("No rider configuration for this product.")
 
-                if count_mode == "Set Individual Counts for Each Epic":
-                    if epic_key == "EntryAge" or epic_key == "PremiumPayingTerm" or epic_key == "PolicyTerm" or epic_key == "MaturityAge":
-
-                        is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                        with st.expander("Show/Hide PPT Configuration", expanded=False):
-                            ppt_age_ranges, ppt_pos_counts, ppt_neg_counts, ppt_enabled = {}, {}, {}, {}
-
-                            header = st.columns([0.5, 2, 2, 1, 1])
-                            # with header[0]: st.markdown("**Enable**")
-                            with header[1]: st.markdown("**PPT Name**")
-                            with header[2]: st.markdown("**Min/Max**")
-                            with header[3]: st.markdown("**Pos**")
-                            with header[4]: st.markdown("**Neg**")
-
-                            for ppt in ppt_names:
-                                row = st.columns([0.5, 2, 2, 1, 1])
-                                with row[0]:
-                                    enabled = st.checkbox("Enable", value=is_selected, key=f"ppt_enabled_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-                                with row[1]: st.markdown(ppt)
-                                with row[2]:
-                                    if(epic_key == "EntryAge"):
-                                        min_age, max_age = st.slider("Entry Age", 0, 85, entry_age_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}_rider",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "PolicyTerm"):
-                                        min_age, max_age = st.slider("Policy Term", 5, 80, policy_term_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}_rider",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "MaturityAge"):
-                                        min_age, max_age = st.slider("Maturity Age", 19, 75, maturity_age_ppt_ranges[ppt], key=f"maturity_age_slider_{epic_key}_{ppt}_rider",
-                                                                label_visibility="collapsed")
-                                    else:
-                                        if(premium_paying_ppt_ranges[ppt][0] == premium_paying_ppt_ranges[ppt][1]):
-                                            min_age = max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt][0], key=f"entry_age_slider_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-                                        else:
-                                            min_age, max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-                                with row[3]:
-                                    pos = st.number_input("Pos", 0, value=5, key=f"epic_pos_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-                                with row[4]:
-                                    neg = st.number_input("Neg", 0, value=5, key=f"epic_neg_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-
-                                if enabled:
-                                    ppt_age_ranges[ppt] = (min_age, max_age)
-                                    ppt_pos_counts[ppt] = pos
-                                    ppt_neg_counts[ppt] = neg
-                                    ppt_enabled[ppt] = True
-                                else:
-                                    ppt_enabled[ppt] = False
-
-                            if is_selected and any(ppt_enabled.values()):
-                                selected_epics_rider.append(epic_key)
-                                epic_counts_rider[epic_key] = {
-                                    "ppt_age_ranges": ppt_age_ranges,
-                                    "ppt_pos_counts": ppt_pos_counts,
-                                    "ppt_neg_counts": ppt_neg_counts,
-                                    "ppt_enabled": ppt_enabled
-                                }
-                    
-                    elif epic_key == "PaymentFrequency":
-                        row = st.columns([2, 1.5, 1.5])
-                        with row[0]:        
-                            is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                        with row[1]:
-                            pos_count = st.number_input(f"Pos {epic_key}", min_value=0, value=5, key=f"epic_pos_{epic_key}_rider", label_visibility="collapsed", placeholder="Pos")
-                        with row[2]:
-                            neg_count = st.number_input(f"Neg {epic_key}", min_value=0, value=5, key=f"epic_neg_{epic_key}_rider", label_visibility="collapsed", placeholder="Neg")
-
-                        frequency_options = ["Annual", "Half-Yearly", "Quarterly", "Monthly", "Single Pay"]
-                        frequency_map = {"Annual": 1, "Half-Yearly": 2, "Quarterly": 3, "Monthly": 4, "Single Pay": 5}
-                        freq_cols = st.columns(len(frequency_options)+1)
-                        selected_frequencies = []
-                        for i, freq in enumerate(frequency_options):
-                            with freq_cols[i+1]:
-                                if st.checkbox(freq, value=is_selected, key=f"freq_cb_{freq}_rider"):
-                                    selected_frequencies.append(freq)
-
-                        mapped_frequencies = [frequency_map[f] for f in selected_frequencies]
-
-                        if is_selected:
-                            selected_epics.append(epic_key)
-                            epic_counts[epic_key] = {
-                                "positive": pos_count,
-                                "negative": neg_count,
-                                "payment_frequency_options": mapped_frequencies
-                            }
-                    # elif epic_key == "SumAssuredValidation":
-                    #     is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                    #     with st.expander("Show/Hide PPT Configuration", expanded=False):
-
-                    #         header = st.columns([0.5, 2, 1, 1, 1, 1])
-                    #         # with header[0]: st.markdown("**Enable**")
-                    #         with header[1]: st.markdown("**PPT Type**")
-                    #         with header[2]: st.markdown("**Min**")
-                    #         with header[3]: st.markdown("**Max**")
-                    #         with header[4]: st.markdown("**Pos**")
-                    #         with header[5]: st.markdown("**Neg**")
-
-                    #         row_sp = st.columns([0.5, 2, 1, 1, 1, 1])
-                    #         with row_sp[0]:
-                    #             sp = st.checkbox("Enable", value=is_selected, key=f"sa_enabled_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_sp[1]:
-                    #             st.markdown("SinglePay")
-                    #         with row_sp[2]:
-                    #             min_sp = st.number_input("Min SinglePay", min_value=0, value=2500000, key=f"min_sp_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_sp[3]:
-                    #             max_sp = st.number_input("Max SinglePay", min_value=min_sp, value=5000000, key=f"max_sp_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_sp[4]:
-                    #             pos_sp = st.number_input("Pos SinglePay", min_value=0, value=5, key=f"pos_sp_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_sp[5]:
-                    #             neg_sp = st.number_input("Neg SinglePay", min_value=0, value=5, key=f"neg_sp_{epic_key}_rider", label_visibility="collapsed")
-
-                    #         row_oth = st.columns([0.5, 2, 1, 1, 1, 1])
-                    #         with row_oth[0]:
-                    #             oth = st.checkbox("Enable", value=is_selected, key=f"oth_enabled_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_oth[1]:
-                    #             st.markdown("Others")
-                    #         with row_oth[2]:
-                    #             min_oth = st.number_input("Min Others", min_value=0, value=5000000, key=f"min_oth_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_oth[4]:
-                    #             pos_oth = st.number_input("Pos Others", min_value=0, value=5, key=f"pos_oth_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_oth[5]:
-                    #             neg_oth = st.number_input("Neg Others", min_value=0, value=5, key=f"neg_oth_{epic_key}_rider", label_visibility="collapsed")
-
-                    #         if is_selected:
-                    #             selected_epics_rider.append(epic_key)
-                    #             if epic_key not in epic_counts_rider:
-                    #                 epic_counts_rider[epic_key] = {}
-                    #             if sp:
-                    #                 epic_counts_rider[epic_key]["Single Pay"] = {
-                    #                     "min_val": min_sp,
-                    #                     "max_val": max_sp,
-                    #                     "positive": num_positive_global,
-                    #                     "negative": num_negative_global
-                    #                 }
-                    #             if oth:
-                    #                 epic_counts_rider[epic_key]["Others"] = {
-                    #                     "min_val": min_oth,
-                    #                     "positive": num_positive_global,
-                    #                     "negative": num_negative_global
-                    #                 }
-
-                    else:
-                        # For other epics, use slider for min/max and number inputs for pos/neg
-                        row = st.columns([2, 1.5, 1.5])
-                        with row[0]:        
-                            is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                        with row[1]:
-                            pos_count = st.number_input(f"Pos {epic_key}", min_value=0, value=5, key=f"epic_pos_{epic_key}_rider", label_visibility="collapsed", placeholder="Pos")
-                        with row[2]:
-                            neg_count = st.number_input(f"Neg {epic_key}", min_value=0, value=5, key=f"epic_neg_{epic_key}_rider", label_visibility="collapsed", placeholder="Neg")
-                        if is_selected:
-                            selected_epics_rider.append(epic_key)
-                            epic_counts_rider[epic_key] = {
-                                "positive": pos_count,
-                                "negative": neg_count
-                            }
-
-                else:  # Apply Same Count to All Epics
-                    if epic_key == "EntryAge" or epic_key == "PremiumPayingTerm" or epic_key == "PolicyTerm" or epic_key == "MaturityAge":
-
-                        is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                        with st.expander("Show/Hide PPT Configuration", expanded=False):
-                            ppt_age_ranges, ppt_enabled = {}, {}
-
-                            for ppt in ppt_names:
-                                row = st.columns([0.5, 2, 2])
-                                with row[0]:
-                                    enabled = st.checkbox("Enable", value=is_selected, key=f"ppt_enabled_all_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-                                with row[1]: st.markdown(ppt)
-                                with row[2]:
-                                    if(epic_key == "EntryAge"):
-                                        min_age, max_age = st.slider("Entry Age", 0, 85, entry_age_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}_rider",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "PolicyTerm"):
-                                        min_age, max_age = st.slider("Policy Term", 5, 80, policy_term_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}_rider",
-                                                                label_visibility="collapsed")
-                                    elif(epic_key == "MaturityAge"):
-                                        min_age, max_age = st.slider("Maturity Age", 19, 75, maturity_age_ppt_ranges[ppt], key=f"maturity_age_slider_{epic_key}_{ppt}_rider",
-                                                                label_visibility="collapsed")
-                                    else:
-                                        if(premium_paying_ppt_ranges[ppt][0] == premium_paying_ppt_ranges[ppt][1]):
-                                            min_age = max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt][0], key=f"entry_age_slider_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-                                        else:
-                                            min_age, max_age = st.slider("Entry Age", 0, 85, premium_paying_ppt_ranges[ppt], key=f"entry_age_slider_{epic_key}_{ppt}_rider", label_visibility="collapsed")
-                                if enabled:
-                                    ppt_age_ranges[ppt] = (min_age, max_age)
-                                    ppt_enabled[ppt] = True
-                                else:
-                                    ppt_enabled[ppt] = False
-
-                            if is_selected and any(ppt_enabled.values()):
-                                selected_epics_rider.append(epic_key)
-                                epic_counts_rider[epic_key] = {
-                                    "ppt_age_ranges": ppt_age_ranges,
-                                    "ppt_enabled": ppt_enabled,
-                                    "positive": num_positive_global,
-                                    "negative": num_negative_global
-                                }
-
-                    elif epic_key == "PaymentFrequency":        
-                        is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                        frequency_options = ["Annual", "Half-Yearly", "Quarterly", "Monthly", "Single Pay"]
-                        frequency_map = {"Annual": 1, "Half-Yearly": 2, "Quarterly": 3, "Monthly": 4, "Single Pay": 5}
-                        freq_cols = st.columns(len(frequency_options)+1)
-                        selected_frequencies = []
-                        for i, freq in enumerate(frequency_options):
-                            with freq_cols[i+1]:
-                                if st.checkbox(freq, value=is_selected, key=f"freq_cb_{freq}_rider"):
-                                    selected_frequencies.append(freq)
-
-                        mapped_frequencies = [frequency_map[f] for f in selected_frequencies]
-
-                        if is_selected:
-                            selected_epics.append(epic_key)
-                            epic_counts[epic_key] = {
-                                "positive": num_positive_global,
-                                "negative": num_negative_global,
-                                "payment_frequency_options": mapped_frequencies
-                            }
-                    # elif epic_key == "SumAssuredValidation":
-                    #     is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                    #     with st.expander("Show/Hide PPT Configuration", expanded=False):
-
-                    #         header = st.columns([0.5, 2, 1, 1])
-                    #         # with header[0]: st.markdown("**Enable**")
-                    #         with header[1]: st.markdown("**PPT Type**")
-                    #         with header[2]: st.markdown("**Min**")
-                    #         with header[3]: st.markdown("**Max**")
-
-                    #         row_sp = st.columns([0.5, 2, 1, 1])
-                    #         with row_sp[0]:
-                    #             sp = st.checkbox("Enable", value=is_selected, key=f"sa_enabled_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_sp[1]:
-                    #             st.markdown("SinglePay")
-                    #         with row_sp[2]:
-                    #             min_sp = st.number_input("Min SinglePay", min_value=0, value=2500000, key=f"min_sp_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_sp[3]:
-                    #             max_sp = st.number_input("Max SinglePay", min_value=min_sp, value=5000000, key=f"max_sp_{epic_key}_rider", label_visibility="collapsed")
-
-                    #         row_oth = st.columns([0.5, 2, 1, 1])
-                    #         with row_oth[0]:
-                    #             oth = st.checkbox("Enable", value=is_selected, key=f"oth_enabled_{epic_key}_rider", label_visibility="collapsed")
-                    #         with row_oth[1]:
-                    #             st.markdown("Others")
-                    #         with row_oth[2]:
-                    #             min_oth = st.number_input("Min Others", min_value=0, value=5000000, key=f"min_oth_{epic_key}_rider", label_visibility="collapsed")
-
-                    #         if is_selected:
-                    #             selected_epics_rider.append(epic_key)
-                    #             if epic_key not in epic_counts_rider:
-                    #                 epic_counts_rider[epic_key] = {}
-                    #             if sp:
-                    #                 epic_counts_rider[epic_key]["Single Pay"] = {
-                    #                     "min_val": min_sp,
-                    #                     "max_val": max_sp,
-                    #                     "positive": num_positive_global,
-                    #                     "negative": num_negative_global
-                    #                 }
-                    #             if oth:
-                    #                 epic_counts_rider[epic_key]["Others"] = {
-                    #                     "min_val": min_oth,
-                    #                     "positive": num_positive_global,
-                    #                     "negative": num_negative_global
-                    #                 }
-
-                    else:
-                        is_selected = st.checkbox(epic_desc, value=select_all_rider, key=f"epic_cb_{epic_key}_rider")
-                        if is_selected:
-                            selected_epics_rider.append(epic_key)
-                            epic_counts_rider[epic_key] = {"positive": num_positive_global, "negative": num_negative_global}
-
-                # print(epic_counts_rider)
-            # print("Rider Epics Selected:", selected_epics_rider)
+        submitted = st.form_submit_button("✅ Apply Configuration", use_container_width=True)
 
-# --- Sidebar buttons for actions ---
-with st.sidebar:
-    st.divider()
-    st.header("Generate")
-    if st.button("🚀 Generate Test Cases", type="primary", disabled=st.session_state.processing, use_container_width=True):
-        if not st.session_state.selected_module_name_py:
-            st.warning("Please select a product.")
-        elif not (selected_epics or selected_epics_rider):
-            st.warning("Please select at least one epic to generate from the main screen.")
-        else:
-            st.session_state.processing = True
-            st.session_state.epic_counts_to_generate = epic_counts
-            st.session_state.epic_counts_to_generate_rider = epic_counts_rider
-            st.rerun() 
+    if submitted:
+        st.session_state.selected_epics = selected_epics
+        st.session_state.epic_counts = epic_counts
+        st.session_state.selected_epics_rider = selected_epics_rider
+        st.session_state.epic_counts_rider = epic_counts_rider
 
-    if st.session_state.generated_df is not None:
-        if st.button("🧹 Clear Results & Start Over", use_container_width=True, disabled=st.session_state.processing):
-            st.session_state.generated_df = None
-            st.session_state.processing = False 
-            st.rerun()
+def run_generation():
+    """Generate test cases inline in the Generate click handler.
 
-# --- Main Canvas Logic ---
-if st.session_state.processing and st.session_state.selected_module_name_py:
+    Running here instead of via a session-state flag saves a full script
+    rerun: click -> generate -> one rerun into the results view, rather than
+    click -> rerun -> generate -> rerun.
+    """
     with st.spinner(f"Generating test cases... Please wait."):
         logic_module = load_logic_module(st.session_state.selected_module_name_py)
         if logic_module:
             if hasattr(logic_module, 'generate_test_cases') and callable(logic_module.generate_test_cases):
                 try:
                     df = logic_module.generate_test_cases(
-                        epic_counts=st.session_state.epic_counts_to_generate,
-                        selected_epics=list(st.session_state.epic_counts_to_generate.keys()),
-                        epic_counts_rider=st.session_state.epic_counts_to_generate_rider,
-                        selected_epics_rider=list(st.session_state.epic_counts_to_generate_rider.keys())                       
+                        epic_counts=st.session_state.epic_counts,
+                        selected_epics=list(st.session_state.epic_counts.keys()),
+                        epic_counts_rider=st.session_state.epic_counts_rider,
+                        selected_epics_rider=list(st.session_state.epic_counts_rider.keys())
                         )
                     st.session_state.generated_df = df
-                    st.success(f"Successfully generated {len(df)} test cases!")
+                    st.session_state.rule_columns = tuple(col for col in df.columns if col.startswith('Rule_'))
+                    from datetime import datetime
+                    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+                    st.session_state.file_prefix = f"{st.session_state.selected_module_name_py}_test_cases_{current_timestamp}"
                 except Exception as e:
                     st.error(f"Error during test case generation:")
                     st.exception(e)
                     st.session_state.generated_df = None
+                    return
             else:
                 st.error(f"Module does not have a 'generate_test_cases' function.")
                 st.session_state.generated_df = None
+                return
         else:
             st.error(f"Failed to load the logic module.") 
             st.session_state.generated_df = None
-    st.session_state.processing = False 
-    st.rerun() 
+            return
+    st.rerun()
 
-elif st.session_state.generated_df is not None:
-    df_to_display = st.session_state.generated_df
-    
-    st.header(f"Generated using: {st.session_state.selected_display_name}")
-    st.divider()
+def _clear_results():
+    st.session_state.generated_df = None
 
-    display_generation_summary(df_to_display)
-    st.divider()
-
-    st.subheader(f"📑 Sample Data (10 random rows from {len(df_to_display)} total)")
-    rule_columns_to_style = [col for col in df_to_display.columns if col.startswith('Rule_')]
-    
-    sample_df = df_to_display.sample(min(10, len(df_to_display)))
-    # sample_df = sample_df.sort_values(by="TUID", ascending=True)
-    st.dataframe(
-        sample_df.style.apply(highlight_rule_outcomes, subset=rule_columns_to_style),
-        height=400, use_container_width=True
-    )
+# --- Sidebar buttons for actions ---
+with st.sidebar:
     st.divider()
+    st.header("Generate")
+    if st.button("🚀 Generate Test Cases", type="primary", use_container_width=True):
+        if not st.session_state.selected_module_name_py:
+            st.warning("Please select a product.")
+        elif not (st.session_state.selected_epics or st.session_state.selected_epics_rider):
+            st.warning("Please select at least one epic and click 'Apply Configuration' on the main screen.")
+        else:
+            run_generation()
 
-    st.subheader("💾 Download Results")
-    current_timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    file_prefix = f"{st.session_state.selected_module_name_py}_test_cases_{current_timestamp}"
-
-    output_excel = BytesIO()
-    with pd.ExcelWriter(output_excel, engine='openpyxl') as writer:
-        df_to_display.to_excel(writer, index=False, sheet_name='TestCases')
-    excel_data = output_excel.getvalue()
-    
-    csv_data = df_to_display.to_csv(index=False).encode('utf-8')
+    if st.session_state.generated_df is not None:
+        # on_click runs before the script pass of the click's rerun, so the
+        # config form (which renders above this handler) already sees the
+        # cleared state — one rerun total, and no second explicit st.rerun().
+        st.button("🧹 Clear Results & Start Over", use_container_width=True,
+                  on_click=_clear_results)
 
-    col_dl1, col_dl2 = st.columns(2)
-    with col_dl1:
-        st.download_button(
-            label="📥 Download Excel File (.xlsx)", data=excel_data,
-            file_name=f"{file_prefix}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True, key="download_excel"
-        )
-    with col_dl2:
-        st.download_button(
-            label="📄 Download CSV File (.csv)", data=csv_data,
-            file_name=f"{file_prefix}.csv", mime="text/csv",
-            use_container_width=True, key="download_csv"
-        )
-    st.caption("Files will download automatically after clicking.")
+# --- Main Canvas Logic ---
+if st.session_state.generated_df is not None:
+    render_results()
 
 elif not st.session_state.selected_module_name_py:
     st.info("👋 Welcome! Please select a product from the sidebar to begin.")